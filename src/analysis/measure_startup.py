@@ -0,0 +1,59 @@
+# src/analysis/measure_startup.py
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# module-level imports each engine script needs before it can even print --help
+# (baseline tree) vs. only once it actually runs (lazy tree)
+HEAVY_IMPORTS = {
+    "facenet": "import torch, torchvision, facenet_pytorch",
+    "deepface": "import numpy; from deepface import DeepFace",
+    "aws": "import boto3",
+    "facepp": "import requests",
+}
+
+def best_of(cmd: list[str], cwd: Path, repeat: int) -> tuple[float, int]:
+    """Fastest wall time (ms) of `repeat` runs, plus the last return code."""
+    best, rc = float("inf"), 0
+    for _ in range(repeat):
+        t = time.perf_counter()
+        rc = subprocess.run(cmd, cwd=cwd, capture_output=True).returncode
+        best = min(best, time.perf_counter() - t)
+    return best * 1000.0, rc
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure CLI / engine startup time (subprocess wall clock)")
+    ap.add_argument("--root", default=str(Path(__file__).resolve().parents[2]),
+                    help="Repo checkout to measure (e.g. a `git worktree` of an older commit)")
+    ap.add_argument("--repeat", type=int, default=5, help="Runs per command; best is reported")
+    args = ap.parse_args()
+
+    root = Path(args.root).resolve()
+    py = sys.executable
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        for name in ("src.jpg", "v1.jpg", "v2.png"):
+            (folder / name).write_bytes(b"x")
+        cases = [
+            ("cli --help", [py, "src/cli.py", "--help"]),
+            ("cli --dry-run", [py, "src/cli.py", "--folder", str(folder), "--source", "src.jpg",
+                               "--outdir", str(folder / "out"), "--dry-run"]),
+        ]
+        for engine in HEAVY_IMPORTS:
+            cases.append((f"{engine} --help", [py, "-m", f"src.compare.run_{engine}_compare", "--help"]))
+            cases.append((f"{engine} missing source", [py, "-m", f"src.compare.run_{engine}_compare",
+                                                       "--folder", str(folder), "--source", "nope.jpg"]))
+        for engine, stmt in HEAVY_IMPORTS.items():
+            cases.append((f"{engine} heavy imports", [py, "-c", stmt]))
+
+        print(f"root: {root}")
+        print(f"{'case':<28} {'best_ms':>8} {'rc':>3}")
+        for label, cmd in cases:
+            ms, rc = best_of(cmd, root, args.repeat)
+            print(f"{label:<28} {ms:>8.0f} {rc:>3}")
+
+if __name__ == "__main__":
+    main()
@@ -5,23 +5,49 @@ import os
 import subprocess
 import sys
 
-def has_env(keys):
-    return all(os.getenv(k) for k in keys)
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # allow `python src/cli.py` from anywhere
+
+from src.compare.registry import (
+    BUILTIN_ENGINES, ENTRY_POINT_GROUP, plan_engine, resolve_engines,
+)
 
 def run(cmd: list[str]):
     print(">", " ".join(cmd))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(ROOT), env.get("PYTHONPATH", "")) if p)
     try:
-        subprocess.run(cmd, check=True)
+        subprocess.run(cmd, check=True, env=env)
     except subprocess.CalledProcessError as e:
         print(f"[WARN] failed -> {e}")
 
+def print_plan(plans: list[dict]):
+    print(f"{'engine':<10} {'targets':>7} {'cached':>6} {'uncached':>8} {'api_calls':>9}  action")
+    for pl in plans:
+        if pl["missing_env"]:
+            action = "skip (missing " + ", ".join(pl["missing_env"]) + ")"
+        elif pl["will_run"]:
+            action = f"run -> {pl['outfile']}"
+        else:
+            action = f"cached ({pl['outfile']})"
+        print(f"{pl['engine']:<10} {pl['targets']:>7} {pl['cached']:>6} {pl['uncached']:>8} "
+              f"{pl['api_calls']:>9}  {action}")
+    print(f"[PLAN] engines to run: {sum(pl['will_run'] for pl in plans)}, "
+          f"estimated API calls: {sum(pl['api_calls'] for pl in plans)}")
+
 def main():
     ap = argparse.ArgumentParser(description="Run selected engines over a folder (source vs variants).")
     ap.add_argument("--folder", required=True, help="Folder containing images (source + variants)")
     ap.add_argument("--source", required=True, help="Source image filename (inside folder)")
     ap.add_argument("--outdir", default="results/csv", help="Output directory for CSVs")
     ap.add_argument("--engines", default="facenet,deepface,aws,facepp",
-                    help="Comma-separated engines: facenet,deepface,aws,facepp")
+                    help="Comma-separated engines: " + ",".join(BUILTIN_ENGINES)
+                         + f" (plus any registered under the '{ENTRY_POINT_GROUP}' entry-point group)")
+    ap.add_argument("--dry-run", action="store_true",
+                    help="Plan the job (files, cached vs uncached, API calls) without loading any model")
+    ap.add_argument("--skip-cached", action="store_true",
+                    help="Skip engines whose CSV (per its .manifest.json) already covers every image")
     args = ap.parse_args()
 
     folder = Path(args.folder)
@@ -29,47 +55,37 @@ def main():
         raise SystemExit(f"Folder not found: {folder}")
 
     source = args.source
+    if not (folder / source).exists():
+        raise SystemExit(f"Source not found: {folder / source}")
     outdir = Path(args.outdir)
-    outdir.mkdir(parents=True, exist_ok=True)
 
-    engines = [e.strip().lower() for e in args.engines.split(",") if e.strip()]
-    engines = [e for e in engines if e in {"facenet", "deepface", "aws", "facepp"}]
+    names = [e.strip().lower() for e in args.engines.split(",") if e.strip()]
+    registry = resolve_engines(names)
+    for name in names:
+        if name not in registry:
+            print(f"[WARN] unknown engine '{name}' — ignored")
+    engines = [registry[n] for n in names if n in registry]
     if not engines:
         raise SystemExit("No valid engines specified.")
 
-    # Facenet
-    if "facenet" in engines:
-        run([sys.executable, "src/compare/run_facenet_compare.py",
-             "--folder", str(folder),
-             "--source", source,
-             "--outfile", str(outdir / "facenet_results.csv")])
+    plans = [plan_engine(spec, folder, source, outdir, skip_cached=args.skip_cached) for spec in engines]
+    if args.dry_run:
+        print_plan(plans)
+        return
 
-    # DeepFace
-    if "deepface" in engines:
-        run([sys.executable, "src/compare/run_deepface_compare.py",
+    outdir.mkdir(parents=True, exist_ok=True)
+    for spec, pl in zip(engines, plans):
+        if pl["missing_env"]:
+            print(f"[INFO] Skipping {spec.name} (missing {', '.join(pl['missing_env'])} in .env)")
+            continue
+        if not pl["will_run"]:
+            print(f"[INFO] Skipping {spec.name} (cached: {pl['outfile']})")
+            continue
+        # the compare script writes <outfile>.manifest.json for the rows it produced
+        run([sys.executable, "-m", spec.module,
              "--folder", str(folder),
              "--source", source,
-             "--outfile", str(outdir / "deepface_results.csv")])
-
-    # AWS Rekognition
-    if "aws" in engines:
-        if has_env(["AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"]):
-            run([sys.executable, "src/compare/run_aws_compare.py",
-                 "--folder", str(folder),
-                 "--source", source,
-                 "--outfile", str(outdir / "aws_results.csv")])
-        else:
-            print("[INFO] Skipping AWS (missing AWS_* keys in .env)")
-
-    # Face++
-    if "facepp" in engines:
-        if has_env(["FACEPP_API_KEY", "FACEPP_API_SECRET"]):
-            run([sys.executable, "src/compare/run_facepp_compare.py",
-                 "--folder", str(folder),
-                 "--source", source,
-                 "--outfile", str(outdir / "facepp_results.csv")])
-        else:
-            print("[INFO] Skipping Face++ (missing FACEPP_* keys in .env)")
+             "--outfile", str(pl["outfile"])])
 
     print("[OK] Done. Check CSVs in:", outdir)
 
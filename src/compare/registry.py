@@ -0,0 +1,139 @@
+# src/compare/registry.py
+"""
+Engine registry for the CLI.
+
+Each engine is described by an EngineSpec that names the module to run
+(``python -m <module>``) instead of importing it, so listing, validating and
+planning a job never loads torch / deepface / boto3. The heavy stack is only
+imported inside the engine process when it actually runs.
+
+Third-party engines register through the ``privacy_aware_face.engines``
+entry-point group; the entry point must resolve to an EngineSpec. Entry points
+are only scanned when a requested name is not built in (the scan itself costs
+tens of milliseconds on a typical environment).
+"""
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+import os
+
+from src.utils.io_helpers import IMAGE_EXTS
+from src.utils.manifest import load_manifest, stat_key
+
+ENTRY_POINT_GROUP = "privacy_aware_face.engines"
+
+
+class EngineSpec(NamedTuple):
+    name: str
+    module: str                     # runnable with `python -m <module>`
+    outfile: str                    # CSV filename inside --outdir
+    env_keys: Tuple[str, ...] = ()  # all must be set, otherwise the engine is skipped
+    api_calls_per_target: int = 0   # remote calls billed per source/target pair
+    description: str = ""
+
+
+BUILTIN_ENGINES: Dict[str, EngineSpec] = {
+    spec.name: spec for spec in (
+        EngineSpec("facenet", "src.compare.run_facenet_compare", "facenet_results.csv",
+                   description="FaceNet (InceptionResnetV1, vggface2), local"),
+        EngineSpec("deepface", "src.compare.run_deepface_compare", "deepface_results.csv",
+                   description="DeepFace (ArcFace), local"),
+        EngineSpec("aws", "src.compare.run_aws_compare", "aws_results.csv",
+                   env_keys=("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"),
+                   api_calls_per_target=1,
+                   description="AWS Rekognition CompareFaces"),
+        EngineSpec("facepp", "src.compare.run_facepp_compare", "facepp_results.csv",
+                   env_keys=("FACEPP_API_KEY", "FACEPP_API_SECRET"),
+                   api_calls_per_target=1,
+                   description="Face++ compare API"),
+    )
+}
+
+
+def _entry_points():
+    from importlib import metadata
+
+    eps = metadata.entry_points()
+    if hasattr(eps, "select"):  # Python 3.10+
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+    return list(eps.get(ENTRY_POINT_GROUP, []))
+
+
+def available_engines() -> Dict[str, EngineSpec]:
+    """Built-in engines plus any registered through entry points (built-ins win on name clash)."""
+    engines = dict(BUILTIN_ENGINES)
+    for ep in _entry_points():
+        if ep.name in engines:
+            continue
+        try:
+            spec = ep.load()
+        except Exception as e:
+            print(f"[WARN] engine plugin '{ep.name}' failed to load ({e}) — skipped")
+            continue
+        if not isinstance(spec, EngineSpec):
+            print(f"[WARN] engine plugin '{ep.name}' is not an EngineSpec — skipped")
+            continue
+        engines[ep.name] = spec
+    return engines
+
+
+def resolve_engines(names: List[str]) -> Dict[str, EngineSpec]:
+    """Specs for the requested names; unknown names are simply left out."""
+    registry = BUILTIN_ENGINES
+    if any(n not in registry for n in names):
+        registry = available_engines()
+    return {n: registry[n] for n in names if n in registry}
+
+
+def missing_env(spec: EngineSpec) -> List[str]:
+    return [k for k in spec.env_keys if not os.getenv(k)]
+
+
+def list_targets(folder: Path, source: str) -> List[Path]:
+    """Variant images the engines will compare against the source (same filter as the compare scripts)."""
+    return [
+        p for p in sorted(folder.iterdir())
+        if p.is_file() and p.name != source and p.suffix.lower() in IMAGE_EXTS
+    ]
+
+
+def cached_targets(outfile: Path, folder: Path, source: str, targets: List[Path]) -> List[Path]:
+    """
+    Targets covered by an existing result CSV, according to the manifest the
+    compare script wrote next to it (only images that got a row are listed).
+    Each target must match by raw filename, size and mtime; anything else
+    counts as uncached. Engines that write no manifest are never cached.
+    """
+    manifest = load_manifest(outfile, folder, source)
+    if manifest is None:
+        return []
+    done = manifest.get("targets", {})
+    return [p for p in targets if done.get(p.name) == stat_key(p)]
+
+
+def plan_engine(spec: EngineSpec, folder: Path, source: str, outdir: Path,
+                skip_cached: bool = False) -> Dict:
+    """
+    Work one engine would do for this job, computed without importing it.
+    The compare scripts always process the whole folder, so an engine runs
+    (and bills one call per target) unless skip_cached is set and its CSV
+    already covers every target.
+    """
+    targets = list_targets(folder, source)
+    outfile = outdir / spec.outfile
+    cached = cached_targets(outfile, folder, source, targets)
+    missing = missing_env(spec)
+    fully_cached = (
+        len(cached) == len(targets)
+        and load_manifest(outfile, folder, source) is not None
+    )
+    will_run = not missing and not (skip_cached and fully_cached)
+    return {
+        "engine": spec.name,
+        "outfile": outfile,
+        "targets": len(targets),
+        "cached": len(cached),
+        "uncached": len(targets) - len(cached),
+        "missing_env": missing,
+        "will_run": will_run,
+        "api_calls": len(targets) * spec.api_calls_per_target if will_run else 0,
+    }
@@ -3,15 +3,10 @@ import argparse
 import time
 from pathlib import Path
 
-import boto3
-from botocore.config import Config
-from botocore.exceptions import ClientError, EndpointConnectionError, ConnectionClosedError, ReadTimeoutError
-
 from src.utils.filename_cleaner import clean_filename
 from src.utils.bucketer import bucket_from_p
-from src.utils.io_helpers import save_csv, load_env
-
-EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+from src.utils.io_helpers import save_csv, load_env, IMAGE_EXTS
+from src.utils.manifest import save_manifest, stat_key
 
 RETRY_ERRORS = {
     "Throttling",
@@ -28,6 +23,8 @@ def compare_with_retry(client, src_bytes: bytes, tgt_bytes: bytes, threshold: fl
     Exponential backoff: 1.5s, 3.0s, 4.5s ...
     Retries on common transient AWS errors and network timeouts.
     """
+    from botocore.exceptions import ClientError, EndpointConnectionError, ConnectionClosedError, ReadTimeoutError
+
     attempt = 0
     while True:
         attempt += 1
@@ -60,6 +57,11 @@ def main():
     ap.add_argument("--retries", type=int, default=3, help="Max retries on transient errors")
     args = ap.parse_args()
 
+    folder = Path(args.folder)
+    src_path = folder / args.source
+    if not src_path.exists():
+        raise FileNotFoundError(f"Source not found: {src_path}")
+
     env = load_env()
     region = env["AWS_REGION"] or "us-east-1"
     key = env["AWS_ACCESS_KEY_ID"]
@@ -67,6 +69,11 @@ def main():
     if not key or not secret:
         raise SystemExit("AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY not set in .env")
 
+    # heavy stack is imported only once there is real work to do
+    import boto3
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+
     cfg = Config(
         region_name=region,
         retries={"max_attempts": 0},  # we handle retries ourselves
@@ -80,21 +87,19 @@ def main():
         config=cfg,
     )
 
-    folder = Path(args.folder)
-    src_path = folder / args.source
-    if not src_path.exists():
-        raise FileNotFoundError(f"Source not found: {src_path}")
-
+    src_stat = stat_key(src_path)
     src_bytes = src_path.read_bytes()
 
     rows = []
+    done = {}  # raw filename -> stat_key, for the manifest
     for p in sorted(folder.iterdir()):
         if not p.is_file() or p.name == args.source:
             continue
-        if p.suffix.lower() not in EXTS:
+        if p.suffix.lower() not in IMAGE_EXTS:
             continue
 
         try:
+            st = stat_key(p)
             tgt_bytes = p.read_bytes()
             resp = compare_with_retry(
                 client,
@@ -112,6 +117,7 @@ def main():
                 "p": round(float(p_val), 1),
                 "bucket": bucket_from_p(float(p_val)),
             })
+            done[p.name] = st
         except ClientError as e:
             code = e.response.get("Error", {}).get("Code", "Unknown")
             print(f"[WARN] {p.name}: AWS ClientError {code} — skipped")
@@ -120,6 +126,7 @@ def main():
 
     rows.sort(key=lambda r: r["p"], reverse=True)
     save_csv(rows, ["filename", "cosine", "p", "bucket"], args.outfile)
+    save_manifest(args.outfile, folder, args.source, src_stat, done)
     print(f"[OK] saved: {args.outfile} ({len(rows)} rows)")
 
 if __name__ == "__main__":
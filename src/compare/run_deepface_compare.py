@@ -1,16 +1,18 @@
 # src/compare/run_deepface_compare.py
+from __future__ import annotations
+
 import argparse
 from pathlib import Path
-import numpy as np
-
-from deepface import DeepFace
 
 from src.utils.filename_cleaner import clean_filename
 from src.utils.bucketer import bucket_from_p
-from src.utils.io_helpers import save_csv
+from src.utils.io_helpers import save_csv, IMAGE_EXTS
+from src.utils.manifest import save_manifest, stat_key
 
 # ---------- helpers ----------
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    import numpy as np
+
     a = a / (np.linalg.norm(a) + 1e-8)
     b = b / (np.linalg.norm(b) + 1e-8)
     return float((a * b).sum())
@@ -20,6 +22,10 @@ def cosine_to_percent(cos: float) -> float:
     return (cos + 1.0) * 50.0
 
 def embed(path: str) -> np.ndarray:
+    # imported lazily: pulls in TensorFlow, so keep it off the --help path
+    import numpy as np
+    from deepface import DeepFace
+
     # Using ArcFace to diversify from FaceNet script
     rep = DeepFace.represent(img_path=path, model_name="ArcFace", detector_backend="skip")
     # DeepFace.represent returns list[dict] in recent versions; handle both
@@ -41,16 +47,18 @@ def main():
     if not src_path.exists():
         raise FileNotFoundError(f"Source not found: {src_path}")
 
+    src_stat = stat_key(src_path)
     src_emb = embed(str(src_path))
 
-    exts = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
     rows = []
+    done = {}  # raw filename -> stat_key, for the manifest
     for p in sorted(folder.iterdir()):
         if not p.is_file() or p.name == args.source:
             continue
-        if p.suffix.lower() not in exts:
+        if p.suffix.lower() not in IMAGE_EXTS:
             continue
         try:
+            st = stat_key(p)
             emb = embed(str(p))
             cos = cosine_similarity(src_emb, emb)
             perc = cosine_to_percent(cos)
@@ -60,11 +68,13 @@ def main():
                 "p": round(perc, 1),
                 "bucket": bucket_from_p(perc),
             })
+            done[p.name] = st
         except Exception as e:
             print(f"[WARN] failed: {p.name} ({e})")
 
     rows.sort(key=lambda r: r["p"], reverse=True)
     save_csv(rows, ["filename", "cosine", "p", "bucket"], args.outfile)
+    save_manifest(args.outfile, folder, args.source, src_stat, done)
     print(f"[OK] saved: {args.outfile} ({len(rows)} rows)")
 
 if __name__ == "__main__":
@@ -1,20 +1,21 @@
+from __future__ import annotations
+
 import argparse
 import os
 import csv
 from pathlib import Path
 
-import torch
-import numpy as np
-from PIL import Image
-from torchvision import transforms
-from facenet_pytorch import InceptionResnetV1
-
 from src.utils.filename_cleaner import clean_filename
 from src.utils.bucketer import bucket_from_p
+from src.utils.io_helpers import IMAGE_EXTS
+from src.utils.manifest import save_manifest, stat_key
 
 # ---------- helpers ----------
 def load_image(path: str, size: int = 160) -> torch.Tensor:
     """Load an image file and convert to normalized CHW tensor for FaceNet."""
+    from PIL import Image
+    from torchvision import transforms
+
     img = Image.open(path).convert("RGB")
     t = transforms.Compose([
         transforms.Resize((size, size)),
@@ -40,29 +41,35 @@ def main():
     parser.add_argument("--outfile", default="facenet_results.csv", help="Output CSV path.")
     args = parser.parse_args()
 
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = InceptionResnetV1(pretrained="vggface2").eval().to(device)
-
     folder = Path(args.folder)
     src_path = folder / args.source
     if not src_path.exists():
         raise FileNotFoundError(f"Source not found: {src_path}")
 
+    # heavy stack is imported only once there is real work to do
+    import torch
+    from facenet_pytorch import InceptionResnetV1
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = InceptionResnetV1(pretrained="vggface2").eval().to(device)
+
     # embed source
+    src_stat = stat_key(src_path)
     with torch.no_grad():
         src_img = load_image(str(src_path)).unsqueeze(0).to(device)  # 1x3x160x160
         src_emb = model(src_img).squeeze(0)  # 512-dim
 
     # iterate targets
-    exts = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
     rows = []
+    done = {}  # raw filename -> stat_key, for the manifest
     for p in sorted(folder.iterdir()):
         if not p.is_file() or p.name == args.source:
             continue
-        if p.suffix.lower() not in exts:
+        if p.suffix.lower() not in IMAGE_EXTS:
             continue
 
         try:
+            st = stat_key(p)
             with torch.no_grad():
                 img = load_image(str(p)).unsqueeze(0).to(device)
                 emb = model(img).squeeze(0)
@@ -74,6 +81,7 @@ def main():
                 "p": round(perc, 1),
                 "bucket": bucket_from_p(perc),
             })
+            done[p.name] = st
         except Exception as e:
             # skip problematic files but keep running
             print(f"[WARN] failed: {p.name} ({e})")
@@ -91,6 +99,7 @@ def main():
         writer.writeheader()
         writer.writerows(rows)
 
+    save_manifest(out_path, folder, args.source, src_stat, done)
     print(f"[OK] saved: {out_path} ({len(rows)} rows)")
 
 if __name__ == "__main__":
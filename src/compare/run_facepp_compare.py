@@ -2,13 +2,11 @@
 import argparse
 from pathlib import Path
 import time
-import requests
 
 from src.utils.filename_cleaner import clean_filename
 from src.utils.bucketer import bucket_from_p
-from src.utils.io_helpers import save_csv, load_env
-
-EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+from src.utils.io_helpers import save_csv, load_env, IMAGE_EXTS
+from src.utils.manifest import save_manifest, stat_key
 API_URL = "https://api-us.faceplusplus.com/facepp/v3/compare"  # change region if needed
 
 def post_with_retry(files, data, timeout=30, max_retries=3, base_delay=1.5):
@@ -16,6 +14,8 @@ def post_with_retry(files, data, timeout=30, max_retries=3, base_delay=1.5):
     Simple exponential backoff: 1.5s, 3.0s, 4.5s ...
     Retries on network errors or 5xx. 4xx는 즉시 실패.
     """
+    import requests
+
     attempt = 0
     while True:
         attempt += 1
@@ -46,26 +46,29 @@ def main():
     ap.add_argument("--retries", type=int, default=3, help="Max retries on transient errors")
     args = ap.parse_args()
 
+    folder = Path(args.folder)
+    src_path = folder / args.source
+    if not src_path.exists():
+        raise FileNotFoundError(f"Source not found: {src_path}")
+
     env = load_env()
     key = env["FACEPP_API_KEY"]
     secret = env["FACEPP_API_SECRET"]
     if not key or not secret:
         raise SystemExit("FACEPP_API_KEY / FACEPP_API_SECRET not set in .env")
 
-    folder = Path(args.folder)
-    src_path = folder / args.source
-    if not src_path.exists():
-        raise FileNotFoundError(f"Source not found: {src_path}")
-
+    src_stat = stat_key(src_path)
     rows = []
+    done = {}  # raw filename -> stat_key, for the manifest
     for p in sorted(folder.iterdir()):
         if not p.is_file() or p.name == args.source:
             continue
-        if p.suffix.lower() not in EXTS:
+        if p.suffix.lower() not in IMAGE_EXTS:
             continue
 
         f1 = f2 = None
         try:
+            st = stat_key(p)
             f1 = open(src_path, "rb")
             f2 = open(p, "rb")
             files = {"image_file1": f1, "image_file2": f2}
@@ -81,6 +84,7 @@ def main():
                 "p": round(conf, 1),
                 "bucket": bucket_from_p(conf),
             })
+            done[p.name] = st
         except Exception as e:
             print(f"[WARN] failed: {p.name} ({e})")
         finally:
@@ -92,6 +96,7 @@ def main():
 
     rows.sort(key=lambda r: r["p"], reverse=True)
     save_csv(rows, ["filename", "cosine", "p", "bucket"], args.outfile)
+    save_manifest(args.outfile, folder, args.source, src_stat, done)
     print(f"[OK] saved: {args.outfile} ({len(rows)} rows)")
 
 if __name__ == "__main__":
@@ -4,7 +4,7 @@ from typing import Dict, List
 import csv
 import os
 
-from dotenv import load_dotenv
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
 
 def ensure_parent_dir(path_str: str) -> None:
     Path(path_str).parent.mkdir(parents=True, exist_ok=True)
@@ -17,6 +17,8 @@ def save_csv(rows: List[Dict], fieldnames: List[str], out_path: str) -> None:
         w.writerows(rows)
 
 def load_env() -> Dict[str, str]:
+    from dotenv import load_dotenv
+
     load_dotenv()  # loads .env if present
     return {
         "AWS_ACCESS_KEY_ID": os.getenv("AWS_ACCESS_KEY_ID", ""),
@@ -0,0 +1,48 @@
+# src/utils/manifest.py
+"""
+Sidecar manifest (<csv>.manifest.json) recording which inputs a result CSV
+covers. Written by the compare scripts themselves, listing only the images
+they produced a row for; read by the CLI registry to plan cached work.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+def manifest_path(outfile) -> Path:
+    outfile = Path(outfile)
+    return outfile.with_name(outfile.name + MANIFEST_SUFFIX)
+
+def stat_key(p: Path) -> List[int]:
+    """(size, mtime_ns) — take it before reading the file, so edits during a run are not recorded as fresh."""
+    st = Path(p).stat()
+    return [st.st_size, st.st_mtime_ns]
+
+def save_manifest(outfile, folder: Path, source: str, source_stat: List[int],
+                  targets: Dict[str, List[int]]) -> None:
+    """targets: raw filename -> stat_key, for the images that made it into the CSV."""
+    manifest = {
+        "folder": str(Path(folder).resolve()),
+        "source": source,
+        "source_stat": source_stat,
+        "targets": targets,
+    }
+    with open(manifest_path(outfile), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+def load_manifest(outfile, folder: Path, source: str) -> Optional[Dict]:
+    """The CSV's manifest, if both exist and it names this folder and an unchanged source."""
+    mpath = manifest_path(outfile)
+    if not Path(outfile).exists() or not mpath.exists():
+        return None
+    try:
+        with open(mpath, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("folder") != str(Path(folder).resolve()) or manifest.get("source") != source:
+        return None
+    if manifest.get("source_stat") != stat_key(Path(folder) / source):
+        return None
+    return manifest
@@ -0,0 +1,174 @@
+# tests/test_registry.py
+import sys, os, subprocess
+import pytest
+sys.path.insert(0, os.getcwd())  # ensure repo root is importable
+
+from src.compare import registry
+from src.compare.registry import (
+    BUILTIN_ENGINES, EngineSpec, available_engines, list_targets, plan_engine, resolve_engines,
+)
+from src.utils.io_helpers import save_csv
+from src.utils.manifest import save_manifest, stat_key
+
+# Modules no startup path (--help, --dry-run, missing source) may import.
+# A meta_path finder turns any such import into an ImportError, so eager imports
+# fail the test whether or not the packages are installed.
+HEAVY = ("torch", "torchvision", "facenet_pytorch", "deepface", "tensorflow",
+         "boto3", "botocore", "numpy", "PIL", "requests")
+BLOCKER = f"""
+import sys
+class _Block:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in {HEAVY!r}:
+            raise ImportError("eager import of " + name)
+sys.meta_path.insert(0, _Block())
+import runpy
+sys.argv = sys.argv[2:]
+target = sys.argv[0]
+if target.endswith(".py"):
+    runpy.run_path(target, run_name="__main__")
+else:
+    runpy.run_module(target, run_name="__main__", alter_sys=True)
+"""
+
+def _run_blocked(*argv):
+    """Run a script path or module with heavy imports blocked; returns CompletedProcess."""
+    return subprocess.run([sys.executable, "-c", BLOCKER, "--", *argv],
+                          capture_output=True, text=True, cwd=os.getcwd())
+
+class FakeEntryPoint:
+    def __init__(self, name, value):
+        self.name, self.value = name, value
+
+    def load(self):
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+def _make_folder(tmp_path, names=("src.jpg", "v1.jpg", "v2.png", "notes.txt")):
+    for name in names:
+        (tmp_path / name).write_bytes(b"x")
+    return tmp_path
+
+def _fake_run(spec, folder, source, outdir, failed=()):
+    """What a compare script leaves behind: CSV plus manifest of the rows it produced."""
+    outfile = outdir / spec.outfile
+    done = {p.name: stat_key(p) for p in list_targets(folder, source) if p.name not in failed}
+    save_csv([{"filename": n} for n in done], ["filename"], str(outfile))
+    save_manifest(outfile, folder, source, stat_key(folder / source), done)
+
+def test_builtin_engines():
+    assert set(BUILTIN_ENGINES) == {"facenet", "deepface", "aws", "facepp"}
+
+def test_plan_uncached(tmp_path, monkeypatch):
+    monkeypatch.setenv("FACEPP_API_KEY", "k")
+    monkeypatch.setenv("FACEPP_API_SECRET", "s")
+    folder = _make_folder(tmp_path)
+    pl = plan_engine(BUILTIN_ENGINES["facepp"], folder, "src.jpg", tmp_path / "out")
+    assert (pl["targets"], pl["cached"], pl["uncached"]) == (2, 0, 2)
+    assert pl["will_run"] and pl["api_calls"] == 2
+
+def test_plan_cached(tmp_path):
+    folder = _make_folder(tmp_path)
+    outdir = tmp_path / "out"
+    _fake_run(BUILTIN_ENGINES["facenet"], folder, "src.jpg", outdir)
+    pl = plan_engine(BUILTIN_ENGINES["facenet"], folder, "src.jpg", outdir, skip_cached=True)
+    assert (pl["cached"], pl["uncached"]) == (2, 0)
+    assert not pl["will_run"] and pl["api_calls"] == 0
+    # default run is unconditional; cached counts are only reported
+    pl = plan_engine(BUILTIN_ENGINES["facenet"], folder, "src.jpg", outdir)
+    assert pl["cached"] == 2 and pl["will_run"]
+
+def test_plan_failed_target_is_uncached(tmp_path):
+    folder = _make_folder(tmp_path)
+    outdir = tmp_path / "out"
+    _fake_run(BUILTIN_ENGINES["facenet"], folder, "src.jpg", outdir, failed=("v2.png",))
+    pl = plan_engine(BUILTIN_ENGINES["facenet"], folder, "src.jpg", outdir, skip_cached=True)
+    assert (pl["cached"], pl["uncached"]) == (1, 1)
+    assert pl["will_run"]
+
+def test_plan_csv_without_manifest_is_uncached(tmp_path):
+    folder = _make_folder(tmp_path)
+    outdir = tmp_path / "out"
+    save_csv([{"filename": "v1.jpg"}, {"filename": "v2.png"}], ["filename"], str(outdir / "facenet_results.csv"))
+    pl = plan_engine(BUILTIN_ENGINES["facenet"], folder, "src.jpg", outdir, skip_cached=True)
+    assert pl["cached"] == 0 and pl["will_run"]
+
+def test_plan_other_source_is_not_cached(tmp_path):
+    folder = _make_folder(tmp_path, ("a.jpg", "b.jpg", "v1.jpg"))
+    outdir = tmp_path / "out"
+    _fake_run(BUILTIN_ENGINES["facenet"], folder, "a.jpg", outdir)
+    pl = plan_engine(BUILTIN_ENGINES["facenet"], folder, "b.jpg", outdir, skip_cached=True)
+    assert pl["cached"] == 0 and pl["will_run"]
+
+def test_plan_other_folder_is_not_cached(tmp_path):
+    outdir = tmp_path / "out"
+    (tmp_path / "one").mkdir()
+    (tmp_path / "two").mkdir()
+    first, second = _make_folder(tmp_path / "one"), _make_folder(tmp_path / "two")
+    _fake_run(BUILTIN_ENGINES["facenet"], first, "src.jpg", outdir)
+    pl = plan_engine(BUILTIN_ENGINES["facenet"], second, "src.jpg", outdir, skip_cached=True)
+    assert pl["cached"] == 0 and pl["will_run"]
+
+def test_plan_cleaned_name_collision(tmp_path):
+    folder = _make_folder(tmp_path, ("src.jpg", "x_abc123.jpg"))
+    outdir = tmp_path / "out"
+    _fake_run(BUILTIN_ENGINES["facenet"], folder, "src.jpg", outdir)
+    (folder / "x_def456.jpg").write_bytes(b"x")  # cleans to the same x.jpg
+    pl = plan_engine(BUILTIN_ENGINES["facenet"], folder, "src.jpg", outdir, skip_cached=True)
+    assert (pl["cached"], pl["uncached"]) == (1, 1) and pl["will_run"]
+
+def test_plan_zero_targets_without_csv_runs(tmp_path):
+    folder = _make_folder(tmp_path, ("src.jpg",))
+    pl = plan_engine(BUILTIN_ENGINES["facenet"], folder, "src.jpg", tmp_path / "out", skip_cached=True)
+    assert pl["targets"] == 0 and pl["will_run"]
+
+def test_available_engines_plugins(monkeypatch):
+    plugin = EngineSpec("myengine", "my_pkg.run_compare", "myengine_results.csv")
+    clash = EngineSpec("facenet", "other.module", "other.csv")
+    monkeypatch.setattr(registry, "_entry_points", lambda: [
+        FakeEntryPoint("myengine", plugin),
+        FakeEntryPoint("facenet", clash),
+        FakeEntryPoint("broken", ImportError("no module")),
+        FakeEntryPoint("notspec", object()),
+    ])
+    engines = available_engines()
+    assert engines["myengine"] == plugin
+    assert engines["facenet"] == BUILTIN_ENGINES["facenet"]  # built-ins win on clash
+    assert "broken" not in engines and "notspec" not in engines
+
+def test_resolve_engines_scans_plugins_only_when_needed(monkeypatch):
+    calls = []
+    plugin = EngineSpec("myengine", "my_pkg.run_compare", "myengine_results.csv")
+    monkeypatch.setattr(registry, "_entry_points", lambda: calls.append(1) or [FakeEntryPoint("myengine", plugin)])
+    assert resolve_engines(["facenet", "aws"]) == {"facenet": BUILTIN_ENGINES["facenet"], "aws": BUILTIN_ENGINES["aws"]}
+    assert not calls
+    assert resolve_engines(["facenet", "myengine", "bogus"]) == {"facenet": BUILTIN_ENGINES["facenet"], "myengine": plugin}
+    assert calls
+
+def test_plan_missing_env(tmp_path, monkeypatch):
+    monkeypatch.delenv("AWS_ACCESS_KEY_ID", raising=False)
+    folder = _make_folder(tmp_path)
+    pl = plan_engine(BUILTIN_ENGINES["aws"], folder, "src.jpg", tmp_path / "out")
+    assert "AWS_ACCESS_KEY_ID" in pl["missing_env"]
+    assert not pl["will_run"] and pl["api_calls"] == 0
+
+def test_dry_run_loads_no_model(tmp_path):
+    folder = _make_folder(tmp_path)
+    r = _run_blocked("src/cli.py", "--folder", str(folder), "--source", "src.jpg",
+                     "--outdir", str(tmp_path / "out"), "--dry-run")
+    assert r.returncode == 0, r.stderr
+    assert "[PLAN]" in r.stdout
+
+@pytest.mark.parametrize("engine", sorted(BUILTIN_ENGINES))
+def test_engine_help_loads_no_model(engine):
+    r = _run_blocked(BUILTIN_ENGINES[engine].module, "--help")
+    assert r.returncode == 0, r.stderr
+
+@pytest.mark.parametrize("engine", sorted(BUILTIN_ENGINES))
+def test_engine_missing_source_loads_no_model(tmp_path, engine):
+    folder = _make_folder(tmp_path)
+    r = _run_blocked(BUILTIN_ENGINES[engine].module, "--folder", str(folder), "--source", "nope.jpg",
+                     "--outfile", str(tmp_path / "out.csv"))
+    assert r.returncode != 0
+    assert "Source not found" in r.stderr and "eager import" not in r.stderr, r.stderr